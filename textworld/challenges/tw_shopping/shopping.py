@@ -17,1012 +17,647 @@ References
 """
 
 import os
+import sys
 import itertools
 import textwrap
 import argparse
+import functools
+import collections
 from os.path import join as pjoin
+from types import MappingProxyType
 
-from typing import Mapping, Dict, Optional, List, Tuple
-
-import numpy as np
-import networkx as nx
-from numpy.random import RandomState
-
-import textworld
-from textworld.logic import Proposition
-from textworld.generator.maker import WorldEntity
-from textworld.generator.game import Quest, Event, GameOptions
-from textworld.generator.data import KnowledgeBase
-
-from textworld.utils import encode_seeds
+from typing import TYPE_CHECKING, Mapping, Dict, Optional, List, Tuple
 
 from textworld.challenges import register
 
+if TYPE_CHECKING:
+    import textworld
+    from numpy.random import RandomState
+    from textworld.generator.maker import WorldEntity
+    from textworld.generator.game import GameOptions
+
 
 KB_PATH = pjoin(os.path.dirname(__file__), "textworld_data")
 KB_LOGIC_PATH = pjoin(KB_PATH, "logic")
 KB_LOGIC_DROP_PATH = pjoin(KB_PATH, "logic_drop")
 KB_GRAMMAR_PATH = pjoin(KB_PATH, "text_grammars")
 
-SKILLS = ["list", "take", "open", "drop", "go"]
-
-FRESH_ADJECTIVES = ["fresh"]
-ROTTEN_ADJECTIVES = ["rotten", "expired", "rancid"]
-
-TYPES_OF_COOKING = ["raw", "fried", "roasted", "grilled"]
-TYPES_OF_CUTTING = ["uncut", "chopped", "sliced", "diced"]
-
-TYPES_OF_COOKING_VERBS = {"fried": "fry", "roasted": "roast", "grilled": "grill"}
-TYPES_OF_CUTTING_VERBS = {"chopped": "chop", "sliced": "slice", "diced": "dice"}
-
-FOODS_SPLITS = {
-    'train': [
-        # CLOTHING
-        'jeans',
-        't-shirt',
-        'socks',
-        'suit',
-        'sweater',
-        # HYGIENE
-        'toothpaste',
-        'toothbrush',
-        'deodorant',
-        'detergent',
-        'sponge',
-        # VEG
-        'broccoli',
-        'aubergine',
-        'red radish',
-        # FRUIT
-        'mango',
-        'plum',
-        'white grapes',
-        # MEAT
-        'salmon',
-        'pork bacon', 
-        # STATIONERY
-        'pen',
-        'paper',
-        'eraser',
-        'scissors',
-        'notebook',
-        # TECH & HW
-        'smartphone',
-        'vacuum cleaner',
-        'monitor',
-        'kettle',
-        'microwave',
-        # INGR
-        'condensed milk',
-        'cumin powder',
-        'dark chocolate',
-        # REST
-        'chicken alfredo',
-        'meat shawarma',
-        'tandoori chicken',
-        'shrimp pizza',
-        'corned beef',
-        # ORIG
-        'orange bell pepper',
-        'block of cheese',
-        'black pepper',
-        'red hot pepper',
-        'yellow bell pepper',
-        'banana',
-        'salt',
-        'chicken leg',
-        'cilantro',
-        'white onion',
-        'purple potato',
-        'olive oil',
-        'flour',
-        'red onion',
-        'yellow potato',
-        'parsley',
-        'red potato',
-        'water',
-        'pork chop',
-        'red apple',
-        'chicken wing',
-        'carrot'        
-    ],
-    'valid': [
-        # CLOTHING
-        'shorts',
-        'shirt',
-        'jacket',
-        'skirt',
-        'bra',
-        # HYGIENE
-        'cotton balls',
-        'q tips',
-        'bar soap',
-        'shampoo',
-        'lotion',
-        # VEG
-        'spinach',
-        'pink radish',
-        # FRUIT
-        'pineapple',
-        'red grapes',
-        # MEAT
-        'beef bacon',
-        'cod',
-        # STATIONERY
-        'paper clips',
-        'stapler',
-        'folder',
-        # TECH & HW
-        'coffee maker',
-        'keyboard',
-        'dehumidifier',
-        # INGR
-        'milk chocolate',
-        'maple syrup',
-        # REST
-        'beef lasagne',
-        'cheeseburger',
-        'cottage pie',
-        # ORIG
-        'vegetable oil',
-        'green apple',
-        'red tuna',
-        'green bell pepper',
-        'red bell pepper',
-        'lettuce',
-        'peanut oil',
-        'chicken breast'
-    ],
-    'test': [
-        # CLOTHING
-        'coat',
-        'boots',
-        'hoodie',
-        'boxer shorts',
-        'scarf',
-        # HYGIENE
-        'dental floss',
-        'tissues',
-        'broomstick',
-        'conditioner',
-        'hand sanitiser',
-        # VEG
-        'black radish',
-        # FRUIT
-        'black grapes',
-        # MEAT
-        'turkey bacon',
-        # STATIONERY
-        'pencil',
-        'fountain pen',
-        'highlighter',
-        # TECH & HW
-        'blender',
-        'smartwatch',
-        # INGR
-        'white chocolate',
-        'honey',
-        # REST
-        'shepherds pie',
-        'fried chicken',
-        # ORIG
-        'milk',
-        'yellow onion',
-        'yellow apple',
-        'sugar',
-        'egg',
-        'green hot pepper',
-        'white tuna',
-        'tomato'
-    ],
-}
+SKILLS = ("list", "take", "open", "drop", "go")
+
+FRESH_ADJECTIVES = ("fresh",)
+ROTTEN_ADJECTIVES = ("rotten", "expired", "rancid")
+
+TYPES_OF_COOKING = ("raw", "fried", "roasted", "grilled")
+TYPES_OF_CUTTING = ("uncut", "chopped", "sliced", "diced")
+
+# Every cooking/cutting other than the default, for building fail events.
+_WRONG_COOKING = frozenset(TYPES_OF_COOKING[1:])
+_WRONG_CUTTING = frozenset(TYPES_OF_CUTTING[1:])
+
+TYPES_OF_COOKING_VERBS = MappingProxyType({"fried": "fry", "roasted": "roast", "grilled": "grill"})
+TYPES_OF_CUTTING_VERBS = MappingProxyType({"chopped": "chop", "sliced": "slice", "diced": "dice"})
+
+# Shared preparation singleton for every item that can neither be cooked
+# nor cut, instead of allocating ~100 identical one-element lists below.
+RAW_UNCUT = (("raw", "uncut"),)
+
+
+@functools.lru_cache()
+def _foods_splits():
+    """ Build the per-split food name tables (materialized on first use). """
+    splits = {
+        'train': (
+            # CLOTHING
+            'jeans',
+            't-shirt',
+            'socks',
+            'suit',
+            'sweater',
+            # HYGIENE
+            'toothpaste',
+            'toothbrush',
+            'deodorant',
+            'detergent',
+            'sponge',
+            # VEG
+            'broccoli',
+            'aubergine',
+            'red radish',
+            # FRUIT
+            'mango',
+            'plum',
+            'white grapes',
+            # MEAT
+            'salmon',
+            'pork bacon', 
+            # STATIONERY
+            'pen',
+            'paper',
+            'eraser',
+            'scissors',
+            'notebook',
+            # TECH & HW
+            'smartphone',
+            'vacuum cleaner',
+            'monitor',
+            'kettle',
+            'microwave',
+            # INGR
+            'condensed milk',
+            'cumin powder',
+            'dark chocolate',
+            # REST
+            'chicken alfredo',
+            'meat shawarma',
+            'tandoori chicken',
+            'shrimp pizza',
+            'corned beef',
+            # ORIG
+            'orange bell pepper',
+            'block of cheese',
+            'black pepper',
+            'red hot pepper',
+            'yellow bell pepper',
+            'banana',
+            'salt',
+            'chicken leg',
+            'cilantro',
+            'white onion',
+            'purple potato',
+            'olive oil',
+            'flour',
+            'red onion',
+            'yellow potato',
+            'parsley',
+            'red potato',
+            'water',
+            'pork chop',
+            'red apple',
+            'chicken wing',
+            'carrot'        
+        ),
+        'valid': (
+            # CLOTHING
+            'shorts',
+            'shirt',
+            'jacket',
+            'skirt',
+            'bra',
+            # HYGIENE
+            'cotton balls',
+            'q tips',
+            'bar soap',
+            'shampoo',
+            'lotion',
+            # VEG
+            'spinach',
+            'pink radish',
+            # FRUIT
+            'pineapple',
+            'red grapes',
+            # MEAT
+            'beef bacon',
+            'cod',
+            # STATIONERY
+            'paper clips',
+            'stapler',
+            'folder',
+            # TECH & HW
+            'coffee maker',
+            'keyboard',
+            'dehumidifier',
+            # INGR
+            'milk chocolate',
+            'maple syrup',
+            # REST
+            'beef lasagne',
+            'cheeseburger',
+            'cottage pie',
+            # ORIG
+            'vegetable oil',
+            'green apple',
+            'red tuna',
+            'green bell pepper',
+            'red bell pepper',
+            'lettuce',
+            'peanut oil',
+            'chicken breast'
+        ),
+        'test': (
+            # CLOTHING
+            'coat',
+            'boots',
+            'hoodie',
+            'boxer shorts',
+            'scarf',
+            # HYGIENE
+            'dental floss',
+            'tissues',
+            'broomstick',
+            'conditioner',
+            'hand sanitiser',
+            # VEG
+            'black radish',
+            # FRUIT
+            'black grapes',
+            # MEAT
+            'turkey bacon',
+            # STATIONERY
+            'pencil',
+            'fountain pen',
+            'highlighter',
+            # TECH & HW
+            'blender',
+            'smartwatch',
+            # INGR
+            'white chocolate',
+            'honey',
+            # REST
+            'shepherds pie',
+            'fried chicken',
+            # ORIG
+            'milk',
+            'yellow onion',
+            'yellow apple',
+            'sugar',
+            'egg',
+            'green hot pepper',
+            'white tuna',
+            'tomato'
+        ),
+    }
 
-FOOD_PREPARATIONS_SPLITS = {
-    'train': {
-         # CLOTHING
-        'jeans': [
-            ('raw', 'uncut')
-        ],
-        't-shirt': [
-            ('raw', 'uncut')
-        ],
-        'socks': [
-            ('raw', 'uncut')
-        ],
-        'suit': [
-            ('raw', 'uncut')
-        ],
-        'sweater': [
-            ('raw', 'uncut')
-        ],
-        'toothpaste': [
-            ('raw', 'uncut')
-        ],
-        'toothbrush': [
-            ('raw', 'uncut')
-        ],
-        'deodorant': [
-            ('raw', 'uncut')
-        ],
-        'detergent': [
-            ('raw', 'uncut')
-        ],
-        'sponge': [
-            ('raw', 'uncut')
-        ],
-        'broccoli': [
-            ('raw', 'uncut')
-        ],
-        'aubergine': [
-            ('raw', 'uncut')
-        ],
-        'red radish': [
-            ('raw', 'uncut')
-        ],
-        'mango': [
-            ('raw', 'uncut')
-        ],
-        'plum': [
-            ('raw', 'uncut')
-        ],
-        'white grapes': [
-            ('raw', 'uncut')
-        ],
-        'salmon': [
-            ('raw', 'uncut')
-        ],
-        'pork bacon': [
-            ('raw', 'uncut')
-        ],
-        'pen': [
-            ('raw', 'uncut')
-        ],
-        'paper': [
-            ('raw', 'uncut')
-        ],
-        'eraser': [
-            ('raw', 'uncut')
-        ],
-        'scissors': [
-            ('raw', 'uncut')
-        ],
-        'notebook': [
-            ('raw', 'uncut')
-        ],
-        'smartphone': [
-            ('raw', 'uncut')
-        ],
-        'vacuum cleaner': [
-            ('raw', 'uncut')
-        ],
-        'monitor': [
-            ('raw', 'uncut')
-        ],
-        'kettle': [
-            ('raw', 'uncut')
-        ],
-        'microwave': [
-            ('raw', 'uncut')
-        ],
-        'condensed milk': [
-            ('raw', 'uncut')
-        ],
-        'cumin powder': [
-            ('raw', 'uncut')
-        ],
-        'dark chocolate': [
-            ('raw', 'uncut')
-        ],
-        'chicken alfredo': [
-            ('raw', 'uncut')
-        ],
-        'meat shawarma': [
-            ('raw', 'uncut')
-        ],
-        'tandoori chicken': [
-            ('raw', 'uncut')
-        ],
-        'shrimp pizza': [
-            ('raw', 'uncut')
-        ],
-        'corned beef': [
-            ('raw', 'uncut')
-        ],
-                
-        # ORIGINAL COOOKING 
-        'orange bell pepper': [
-            ('raw', 'chopped'), ('roasted', 'diced'), ('grilled', 'uncut'), ('raw', 'uncut'), ('raw', 'sliced'),
-            ('grilled', 'sliced'), ('roasted', 'sliced'), ('fried', 'diced'), ('grilled', 'chopped')
-        ],
-        'block of cheese': [
-            ('fried', 'diced'), ('fried', 'uncut'), ('grilled', 'chopped'), ('raw', 'chopped'), ('grilled', 'diced'),
-            ('roasted', 'chopped'), ('grilled', 'sliced'), ('raw', 'uncut'), ('raw', 'sliced')
-        ],
-        'black pepper': [
-            ('raw', 'uncut')
-        ],
-        'red hot pepper': [
-            ('roasted', 'sliced'), ('fried', 'chopped'), ('roasted', 'uncut'), ('fried', 'sliced'), ('raw', 'sliced'),
-            ('grilled', 'chopped'), ('fried', 'uncut'), ('raw', 'chopped'), ('grilled', 'sliced')
-        ],
-        'yellow bell pepper': [
-            ('roasted', 'chopped'), ('grilled', 'sliced'), ('fried', 'sliced'), ('raw', 'diced'), ('roasted', 'diced'),
-            ('fried', 'chopped'), ('roasted', 'uncut'), ('grilled', 'uncut'), ('fried', 'uncut')
-        ],
-        'banana': [
-            ('grilled', 'diced'), ('fried', 'chopped'), ('grilled', 'chopped'), ('grilled', 'sliced'), ('fried', 'diced'),
-            ('roasted', 'diced'), ('fried', 'sliced'), ('raw', 'sliced'), ('roasted', 'sliced')
-        ],
-        'salt': [
-            ('raw', 'uncut')
-        ],
-        'chicken leg': [
-            ('grilled', 'uncut')
-        ],
-        'cilantro': [
-            ('raw', 'uncut'), ('raw', 'diced')
-        ],
-        'white onion': [
-            ('grilled', 'uncut'), ('raw', 'chopped'), ('roasted', 'uncut'), ('roasted', 'sliced'), ('fried', 'diced'),
-            ('raw', 'sliced'), ('grilled', 'chopped'), ('roasted', 'chopped'), ('roasted', 'diced')
-        ],
-        'purple potato': [
-            ('roasted', 'sliced'), ('roasted', 'diced'), ('grilled', 'diced'), ('fried', 'chopped'), ('fried', 'sliced'),
-            ('fried', 'diced'), ('roasted', 'uncut')
-        ],
-        'olive oil': [
-            ('raw', 'uncut')
-        ],
-        'flour': [
-            ('raw', 'uncut')
-        ],
-        'red onion': [
-            ('raw', 'uncut'), ('roasted', 'uncut'), ('roasted', 'diced'), ('fried', 'sliced'), ('raw', 'sliced'),
-            ('grilled', 'diced'), ('fried', 'diced'), ('raw', 'diced'), ('grilled', 'sliced')
-        ],
-        'yellow potato': [
-            ('grilled', 'chopped'), ('grilled', 'sliced'), ('fried', 'diced'), ('fried', 'sliced'), ('fried', 'chopped'),
-            ('roasted', 'chopped'), ('roasted', 'uncut')
-        ],
-        'parsley': [
-            ('raw', 'diced'), ('raw', 'sliced')
-        ],
-        'red potato': [
-            ('roasted', 'sliced'), ('grilled', 'chopped'), ('fried', 'uncut'), ('fried', 'chopped'), ('fried', 'diced'),
-            ('fried', 'sliced'), ('roasted', 'diced')
-        ],
-        'water': [
-            ('raw', 'uncut')
-        ],
-        'pork chop': [
-            ('fried', 'sliced'), ('roasted', 'sliced'), ('grilled', 'uncut'), ('roasted', 'diced'), ('grilled', 'diced'),
-            ('fried', 'uncut'), ('fried', 'chopped')
-        ],
-        'red apple': [
-            ('grilled', 'sliced'), ('fried', 'diced'), ('roasted', 'sliced'), ('fried', 'sliced'), ('grilled', 'diced'),
-            ('raw', 'uncut'), ('raw', 'sliced'), ('raw', 'diced'), ('roasted', 'chopped')
-        ],
-        'chicken wing': [
-            ('grilled', 'uncut')
-        ],
-        'carrot': [
-            ('roasted', 'sliced'), ('fried', 'chopped'), ('raw', 'uncut'), ('grilled', 'uncut'), ('roasted', 'uncut'),
-            ('grilled', 'sliced'), ('raw', 'sliced'), ('fried', 'sliced'), ('raw', 'chopped')
-        ]},
-    'valid': {
-        
-        'jeans': [
-            ('raw', 'uncut')
-        ],
-        't-shirt': [
-            ('raw', 'uncut')
-        ],
-        'socks': [
-            ('raw', 'uncut')
-        ],
-        'suit': [
-            ('raw', 'uncut')
-        ],
-        'sweater': [
-            ('raw', 'uncut')
-        ],
-        'toothpaste': [
-            ('raw', 'uncut')
-        ],
-        'toothbrush': [
-            ('raw', 'uncut')
-        ],
-        'deodorant': [
-            ('raw', 'uncut')
-        ],
-        'detergent': [
-            ('raw', 'uncut')
-        ],
-        'sponge': [
-            ('raw', 'uncut')
-        ],
-        'broccoli': [
-            ('raw', 'uncut')
-        ],
-        'aubergine': [
-            ('raw', 'uncut')
-        ],
-        'red radish': [
-            ('raw', 'uncut')
-        ],
-        'mango': [
-            ('raw', 'uncut')
-        ],
-        'plum': [
-            ('raw', 'uncut')
-        ],
-        'white grapes': [
-            ('raw', 'uncut')
-        ],
-        'salmon': [
-            ('raw', 'uncut')
-        ],
-        'pork bacon': [
-            ('raw', 'uncut')
-        ],
-        'pen': [
-            ('raw', 'uncut')
-        ],
-        'paper': [
-            ('raw', 'uncut')
-        ],
-        'eraser': [
-            ('raw', 'uncut')
-        ],
-        'scissors': [
-            ('raw', 'uncut')
-        ],
-        'notebook': [
-            ('raw', 'uncut')
-        ],
-        'smartphone': [
-            ('raw', 'uncut')
-        ],
-        'vacuum cleaner': [
-            ('raw', 'uncut')
-        ],
-        'monitor': [
-            ('raw', 'uncut')
-        ],
-        'kettle': [
-            ('raw', 'uncut')
-        ],
-        'microwave': [
-            ('raw', 'uncut')
-        ],
-        'condensed milk': [
-            ('raw', 'uncut')
-        ],
-        'cumin powder': [
-            ('raw', 'uncut')
-        ],
-        'dark chocolate': [
-            ('raw', 'uncut')
-        ],
-        'chicken alfredo': [
-            ('raw', 'uncut')
-        ],
-        'meat shawarma': [
-            ('raw', 'uncut')
-        ],
-        'tandoori chicken': [
-            ('raw', 'uncut')
-        ],
-        'shrimp pizza': [
-            ('raw', 'uncut')
-        ],
-        'corned beef': [
-            ('raw', 'uncut')
-        ],
-        'orange bell pepper': [('roasted', 'chopped'), ('fried', 'uncut'), ('fried', 'sliced'), ('raw', 'diced')],
-        'block of cheese': [('roasted', 'diced'), ('grilled', 'uncut'), ('raw', 'diced'), ('roasted', 'sliced')],
-        'black pepper': [('raw', 'uncut')],
-        'red hot pepper': [('raw', 'diced'), ('roasted', 'chopped'), ('roasted', 'diced'), ('grilled', 'diced')],
-        'yellow bell pepper': [('raw', 'chopped'), ('roasted', 'sliced'), ('fried', 'diced'), ('raw', 'sliced')],
-        'banana': [('roasted', 'uncut'), ('grilled', 'uncut'), ('raw', 'diced'), ('roasted', 'chopped')],
-        'salt': [('raw', 'uncut')],
-        'chicken leg': [('fried', 'uncut')],
-        'cilantro': [('raw', 'sliced')],
-        'white onion': [('grilled', 'sliced'), ('raw', 'diced'), ('fried', 'chopped'), ('fried', 'uncut')],
-        'purple potato': [('grilled', 'chopped'), ('grilled', 'uncut'), ('fried', 'uncut')],
-        'olive oil': [('raw', 'uncut')],
-        'flour': [('raw', 'uncut')],
-        'red onion': [('roasted', 'chopped'), ('fried', 'chopped'), ('fried', 'uncut'), ('grilled', 'chopped')],
-        'yellow potato': [('roasted', 'diced'), ('grilled', 'uncut'), ('grilled', 'diced')],
-        'parsley': [('raw', 'uncut')],
-        'red potato': [('grilled', 'diced'), ('grilled', 'sliced'), ('roasted', 'chopped')],
-        'water': [('raw', 'uncut')],
-        'pork chop': [('fried', 'diced'), ('roasted', 'chopped'), ('roasted', 'uncut')],
-        'red apple': [('raw', 'chopped'), ('roasted', 'diced'), ('grilled', 'uncut'), ('fried', 'chopped')],
-        'chicken wing': [('roasted', 'uncut')],
-        'carrot': [('grilled', 'chopped'), ('fried', 'uncut'), ('roasted', 'chopped'), ('roasted', 'diced')]},
-    'test': {
-        
-        'jeans': [
-            ('raw', 'uncut')
-        ],
-        't-shirt': [
-            ('raw', 'uncut')
-        ],
-        'socks': [
-            ('raw', 'uncut')
-        ],
-        'suit': [
-            ('raw', 'uncut')
-        ],
-        'sweater': [
-            ('raw', 'uncut')
-        ],
-        'toothpaste': [
-            ('raw', 'uncut')
-        ],
-        'toothbrush': [
-            ('raw', 'uncut')
-        ],
-        'deodorant': [
-            ('raw', 'uncut')
-        ],
-        'detergent': [
-            ('raw', 'uncut')
-        ],
-        'sponge': [
-            ('raw', 'uncut')
-        ],
-        'broccoli': [
-            ('raw', 'uncut')
-        ],
-        'aubergine': [
-            ('raw', 'uncut')
-        ],
-        'red radish': [
-            ('raw', 'uncut')
-        ],
-        'mango': [
-            ('raw', 'uncut')
-        ],
-        'plum': [
-            ('raw', 'uncut')
-        ],
-        'white grapes': [
-            ('raw', 'uncut')
-        ],
-        'salmon': [
-            ('raw', 'uncut')
-        ],
-        'pork bacon': [
-            ('raw', 'uncut')
-        ],
-        'pen': [
-            ('raw', 'uncut')
-        ],
-        'paper': [
-            ('raw', 'uncut')
-        ],
-        'eraser': [
-            ('raw', 'uncut')
-        ],
-        'scissors': [
-            ('raw', 'uncut')
-        ],
-        'notebook': [
-            ('raw', 'uncut')
-        ],
-        'smartphone': [
-            ('raw', 'uncut')
-        ],
-        'vacuum cleaner': [
-            ('raw', 'uncut')
-        ],
-        'monitor': [
-            ('raw', 'uncut')
-        ],
-        'kettle': [
-            ('raw', 'uncut')
-        ],
-        'microwave': [
-            ('raw', 'uncut')
-        ],
-        'condensed milk': [
-            ('raw', 'uncut')
-        ],
-        'cumin powder': [
-            ('raw', 'uncut')
-        ],
-        'dark chocolate': [
-            ('raw', 'uncut')
-        ],
-        'chicken alfredo': [
-            ('raw', 'uncut')
-        ],
-        'meat shawarma': [
-            ('raw', 'uncut')
-        ],
-        'tandoori chicken': [
-            ('raw', 'uncut')
-        ],
-        'shrimp pizza': [
-            ('raw', 'uncut')
-        ],
-        'corned beef': [
-            ('raw', 'uncut')
-        ],
-        'orange bell pepper': [('roasted', 'uncut'), ('fried', 'chopped'), ('grilled', 'diced')],
-        'block of cheese': [('fried', 'chopped'), ('roasted', 'uncut'), ('fried', 'sliced')],
-        'black pepper': [('raw', 'uncut')],
-        'red hot pepper': [('raw', 'uncut'), ('grilled', 'uncut'), ('fried', 'diced')],
-        'yellow bell pepper': [('grilled', 'chopped'), ('raw', 'uncut'), ('grilled', 'diced')],
-        'banana': [('raw', 'chopped'), ('fried', 'uncut'), ('raw', 'uncut')],
-        'salt': [('raw', 'uncut')],
-        'chicken leg': [('roasted', 'uncut')],
-        'cilantro': [('raw', 'chopped')],
-        'white onion': [('raw', 'uncut'), ('fried', 'sliced'), ('grilled', 'diced')],
-        'purple potato': [('grilled', 'sliced'), ('roasted', 'chopped')],
-        'olive oil': [('raw', 'uncut')],
-        'flour': [('raw', 'uncut')],
-        'red onion': [('raw', 'chopped'), ('grilled', 'uncut'), ('roasted', 'sliced')],
-        'yellow potato': [('fried', 'uncut'), ('roasted', 'sliced')],
-        'parsley': [('raw', 'chopped')],
-        'red potato': [('grilled', 'uncut'), ('roasted', 'uncut')],
-        'water': [('raw', 'uncut')],
-        'pork chop': [('grilled', 'sliced'), ('grilled', 'chopped')],
-        'red apple': [('fried', 'uncut'), ('roasted', 'uncut'), ('grilled', 'chopped')],
-        'chicken wing': [('fried', 'uncut')],
-        'carrot': [('raw', 'diced'), ('grilled', 'diced'), ('fried', 'diced')]
+    for split, names in splits.items():
+        assert len(names) == len(set(names)), "Duplicate food name in '{}' split.".format(split)
+
+    return MappingProxyType({split: tuple(sys.intern(name) for name in names)
+                             for split, names in splits.items()})
+
+
+@functools.lru_cache()
+def _food_preparations_splits():
+    """ Build the per-split preparation tables (materialized on first use). """
+    splits = {
+        'train': {
+             # CLOTHING
+            'jeans': RAW_UNCUT,
+            't-shirt': RAW_UNCUT,
+            'socks': RAW_UNCUT,
+            'suit': RAW_UNCUT,
+            'sweater': RAW_UNCUT,
+            'toothpaste': RAW_UNCUT,
+            'toothbrush': RAW_UNCUT,
+            'deodorant': RAW_UNCUT,
+            'detergent': RAW_UNCUT,
+            'sponge': RAW_UNCUT,
+            'broccoli': RAW_UNCUT,
+            'aubergine': RAW_UNCUT,
+            'red radish': RAW_UNCUT,
+            'mango': RAW_UNCUT,
+            'plum': RAW_UNCUT,
+            'white grapes': RAW_UNCUT,
+            'salmon': RAW_UNCUT,
+            'pork bacon': RAW_UNCUT,
+            'pen': RAW_UNCUT,
+            'paper': RAW_UNCUT,
+            'eraser': RAW_UNCUT,
+            'scissors': RAW_UNCUT,
+            'notebook': RAW_UNCUT,
+            'smartphone': RAW_UNCUT,
+            'vacuum cleaner': RAW_UNCUT,
+            'monitor': RAW_UNCUT,
+            'kettle': RAW_UNCUT,
+            'microwave': RAW_UNCUT,
+            'condensed milk': RAW_UNCUT,
+            'cumin powder': RAW_UNCUT,
+            'dark chocolate': RAW_UNCUT,
+            'chicken alfredo': RAW_UNCUT,
+            'meat shawarma': RAW_UNCUT,
+            'tandoori chicken': RAW_UNCUT,
+            'shrimp pizza': RAW_UNCUT,
+            'corned beef': RAW_UNCUT,
+                    
+            # ORIGINAL COOOKING 
+            'orange bell pepper': (
+                ('raw', 'chopped'), ('roasted', 'diced'), ('grilled', 'uncut'), ('raw', 'uncut'), ('raw', 'sliced'),
+                ('grilled', 'sliced'), ('roasted', 'sliced'), ('fried', 'diced'), ('grilled', 'chopped')
+            ),
+            'block of cheese': (
+                ('fried', 'diced'), ('fried', 'uncut'), ('grilled', 'chopped'), ('raw', 'chopped'), ('grilled', 'diced'),
+                ('roasted', 'chopped'), ('grilled', 'sliced'), ('raw', 'uncut'), ('raw', 'sliced')
+            ),
+            'black pepper': RAW_UNCUT,
+            'red hot pepper': (
+                ('roasted', 'sliced'), ('fried', 'chopped'), ('roasted', 'uncut'), ('fried', 'sliced'), ('raw', 'sliced'),
+                ('grilled', 'chopped'), ('fried', 'uncut'), ('raw', 'chopped'), ('grilled', 'sliced')
+            ),
+            'yellow bell pepper': (
+                ('roasted', 'chopped'), ('grilled', 'sliced'), ('fried', 'sliced'), ('raw', 'diced'), ('roasted', 'diced'),
+                ('fried', 'chopped'), ('roasted', 'uncut'), ('grilled', 'uncut'), ('fried', 'uncut')
+            ),
+            'banana': (
+                ('grilled', 'diced'), ('fried', 'chopped'), ('grilled', 'chopped'), ('grilled', 'sliced'), ('fried', 'diced'),
+                ('roasted', 'diced'), ('fried', 'sliced'), ('raw', 'sliced'), ('roasted', 'sliced')
+            ),
+            'salt': RAW_UNCUT,
+            'chicken leg': (
+                ('grilled', 'uncut'),
+            ),
+            'cilantro': (
+                ('raw', 'uncut'), ('raw', 'diced')
+            ),
+            'white onion': (
+                ('grilled', 'uncut'), ('raw', 'chopped'), ('roasted', 'uncut'), ('roasted', 'sliced'), ('fried', 'diced'),
+                ('raw', 'sliced'), ('grilled', 'chopped'), ('roasted', 'chopped'), ('roasted', 'diced')
+            ),
+            'purple potato': (
+                ('roasted', 'sliced'), ('roasted', 'diced'), ('grilled', 'diced'), ('fried', 'chopped'), ('fried', 'sliced'),
+                ('fried', 'diced'), ('roasted', 'uncut')
+            ),
+            'olive oil': RAW_UNCUT,
+            'flour': RAW_UNCUT,
+            'red onion': (
+                ('raw', 'uncut'), ('roasted', 'uncut'), ('roasted', 'diced'), ('fried', 'sliced'), ('raw', 'sliced'),
+                ('grilled', 'diced'), ('fried', 'diced'), ('raw', 'diced'), ('grilled', 'sliced')
+            ),
+            'yellow potato': (
+                ('grilled', 'chopped'), ('grilled', 'sliced'), ('fried', 'diced'), ('fried', 'sliced'), ('fried', 'chopped'),
+                ('roasted', 'chopped'), ('roasted', 'uncut')
+            ),
+            'parsley': (
+                ('raw', 'diced'), ('raw', 'sliced')
+            ),
+            'red potato': (
+                ('roasted', 'sliced'), ('grilled', 'chopped'), ('fried', 'uncut'), ('fried', 'chopped'), ('fried', 'diced'),
+                ('fried', 'sliced'), ('roasted', 'diced')
+            ),
+            'water': RAW_UNCUT,
+            'pork chop': (
+                ('fried', 'sliced'), ('roasted', 'sliced'), ('grilled', 'uncut'), ('roasted', 'diced'), ('grilled', 'diced'),
+                ('fried', 'uncut'), ('fried', 'chopped')
+            ),
+            'red apple': (
+                ('grilled', 'sliced'), ('fried', 'diced'), ('roasted', 'sliced'), ('fried', 'sliced'), ('grilled', 'diced'),
+                ('raw', 'uncut'), ('raw', 'sliced'), ('raw', 'diced'), ('roasted', 'chopped')
+            ),
+            'chicken wing': (
+                ('grilled', 'uncut'),
+            ),
+            'carrot': (
+                ('roasted', 'sliced'), ('fried', 'chopped'), ('raw', 'uncut'), ('grilled', 'uncut'), ('roasted', 'uncut'),
+                ('grilled', 'sliced'), ('raw', 'sliced'), ('fried', 'sliced'), ('raw', 'chopped')
+            )},
+        'valid': {
+            
+            'jeans': RAW_UNCUT,
+            't-shirt': RAW_UNCUT,
+            'socks': RAW_UNCUT,
+            'suit': RAW_UNCUT,
+            'sweater': RAW_UNCUT,
+            'toothpaste': RAW_UNCUT,
+            'toothbrush': RAW_UNCUT,
+            'deodorant': RAW_UNCUT,
+            'detergent': RAW_UNCUT,
+            'sponge': RAW_UNCUT,
+            'broccoli': RAW_UNCUT,
+            'aubergine': RAW_UNCUT,
+            'red radish': RAW_UNCUT,
+            'mango': RAW_UNCUT,
+            'plum': RAW_UNCUT,
+            'white grapes': RAW_UNCUT,
+            'salmon': RAW_UNCUT,
+            'pork bacon': RAW_UNCUT,
+            'pen': RAW_UNCUT,
+            'paper': RAW_UNCUT,
+            'eraser': RAW_UNCUT,
+            'scissors': RAW_UNCUT,
+            'notebook': RAW_UNCUT,
+            'smartphone': RAW_UNCUT,
+            'vacuum cleaner': RAW_UNCUT,
+            'monitor': RAW_UNCUT,
+            'kettle': RAW_UNCUT,
+            'microwave': RAW_UNCUT,
+            'condensed milk': RAW_UNCUT,
+            'cumin powder': RAW_UNCUT,
+            'dark chocolate': RAW_UNCUT,
+            'chicken alfredo': RAW_UNCUT,
+            'meat shawarma': RAW_UNCUT,
+            'tandoori chicken': RAW_UNCUT,
+            'shrimp pizza': RAW_UNCUT,
+            'corned beef': RAW_UNCUT,
+            'orange bell pepper': (('roasted', 'chopped'), ('fried', 'uncut'), ('fried', 'sliced'), ('raw', 'diced')),
+            'block of cheese': (('roasted', 'diced'), ('grilled', 'uncut'), ('raw', 'diced'), ('roasted', 'sliced')),
+            'black pepper': RAW_UNCUT,
+            'red hot pepper': (('raw', 'diced'), ('roasted', 'chopped'), ('roasted', 'diced'), ('grilled', 'diced')),
+            'yellow bell pepper': (('raw', 'chopped'), ('roasted', 'sliced'), ('fried', 'diced'), ('raw', 'sliced')),
+            'banana': (('roasted', 'uncut'), ('grilled', 'uncut'), ('raw', 'diced'), ('roasted', 'chopped')),
+            'salt': RAW_UNCUT,
+            'chicken leg': (('fried', 'uncut'),),
+            'cilantro': (('raw', 'sliced'),),
+            'white onion': (('grilled', 'sliced'), ('raw', 'diced'), ('fried', 'chopped'), ('fried', 'uncut')),
+            'purple potato': (('grilled', 'chopped'), ('grilled', 'uncut'), ('fried', 'uncut')),
+            'olive oil': RAW_UNCUT,
+            'flour': RAW_UNCUT,
+            'red onion': (('roasted', 'chopped'), ('fried', 'chopped'), ('fried', 'uncut'), ('grilled', 'chopped')),
+            'yellow potato': (('roasted', 'diced'), ('grilled', 'uncut'), ('grilled', 'diced')),
+            'parsley': RAW_UNCUT,
+            'red potato': (('grilled', 'diced'), ('grilled', 'sliced'), ('roasted', 'chopped')),
+            'water': RAW_UNCUT,
+            'pork chop': (('fried', 'diced'), ('roasted', 'chopped'), ('roasted', 'uncut')),
+            'red apple': (('raw', 'chopped'), ('roasted', 'diced'), ('grilled', 'uncut'), ('fried', 'chopped')),
+            'chicken wing': (('roasted', 'uncut'),),
+            'carrot': (('grilled', 'chopped'), ('fried', 'uncut'), ('roasted', 'chopped'), ('roasted', 'diced'))},
+        'test': {
+            
+            'jeans': RAW_UNCUT,
+            't-shirt': RAW_UNCUT,
+            'socks': RAW_UNCUT,
+            'suit': RAW_UNCUT,
+            'sweater': RAW_UNCUT,
+            'toothpaste': RAW_UNCUT,
+            'toothbrush': RAW_UNCUT,
+            'deodorant': RAW_UNCUT,
+            'detergent': RAW_UNCUT,
+            'sponge': RAW_UNCUT,
+            'broccoli': RAW_UNCUT,
+            'aubergine': RAW_UNCUT,
+            'red radish': RAW_UNCUT,
+            'mango': RAW_UNCUT,
+            'plum': RAW_UNCUT,
+            'white grapes': RAW_UNCUT,
+            'salmon': RAW_UNCUT,
+            'pork bacon': RAW_UNCUT,
+            'pen': RAW_UNCUT,
+            'paper': RAW_UNCUT,
+            'eraser': RAW_UNCUT,
+            'scissors': RAW_UNCUT,
+            'notebook': RAW_UNCUT,
+            'smartphone': RAW_UNCUT,
+            'vacuum cleaner': RAW_UNCUT,
+            'monitor': RAW_UNCUT,
+            'kettle': RAW_UNCUT,
+            'microwave': RAW_UNCUT,
+            'condensed milk': RAW_UNCUT,
+            'cumin powder': RAW_UNCUT,
+            'dark chocolate': RAW_UNCUT,
+            'chicken alfredo': RAW_UNCUT,
+            'meat shawarma': RAW_UNCUT,
+            'tandoori chicken': RAW_UNCUT,
+            'shrimp pizza': RAW_UNCUT,
+            'corned beef': RAW_UNCUT,
+            'orange bell pepper': (('roasted', 'uncut'), ('fried', 'chopped'), ('grilled', 'diced')),
+            'block of cheese': (('fried', 'chopped'), ('roasted', 'uncut'), ('fried', 'sliced')),
+            'black pepper': RAW_UNCUT,
+            'red hot pepper': (('raw', 'uncut'), ('grilled', 'uncut'), ('fried', 'diced')),
+            'yellow bell pepper': (('grilled', 'chopped'), ('raw', 'uncut'), ('grilled', 'diced')),
+            'banana': (('raw', 'chopped'), ('fried', 'uncut'), ('raw', 'uncut')),
+            'salt': RAW_UNCUT,
+            'chicken leg': (('roasted', 'uncut'),),
+            'cilantro': (('raw', 'chopped'),),
+            'white onion': (('raw', 'uncut'), ('fried', 'sliced'), ('grilled', 'diced')),
+            'purple potato': (('grilled', 'sliced'), ('roasted', 'chopped')),
+            'olive oil': RAW_UNCUT,
+            'flour': RAW_UNCUT,
+            'red onion': (('raw', 'chopped'), ('grilled', 'uncut'), ('roasted', 'sliced')),
+            'yellow potato': (('fried', 'uncut'), ('roasted', 'sliced')),
+            'parsley': (('raw', 'chopped'),),
+            'red potato': (('grilled', 'uncut'), ('roasted', 'uncut')),
+            'water': RAW_UNCUT,
+            'pork chop': (('grilled', 'sliced'), ('grilled', 'chopped')),
+            'red apple': (('fried', 'uncut'), ('roasted', 'uncut'), ('grilled', 'chopped')),
+            'chicken wing': (('fried', 'uncut'),),
+            'carrot': (('raw', 'diced'), ('grilled', 'diced'), ('fried', 'diced'))
+        }
     }
+
+    return MappingProxyType({
+        split: {sys.intern(food): _intern_preparations(preparations)
+                for food, preparations in table.items()}
+        for split, table in splits.items()})
+
+# There are only len(TYPES_OF_COOKING) x len(TYPES_OF_CUTTING) = 16 possible
+# preparations; canonicalize every (cooking, cutting) pair to one shared
+# tuple per combination so the split tables don't hold hundreds of
+# duplicate pair objects.
+_PREPARATIONS_CACHE = {pair: pair for pair in itertools.product(TYPES_OF_COOKING, TYPES_OF_CUTTING)}
+_PREPARATIONS_CACHE[RAW_UNCUT[0]] = RAW_UNCUT[0]
+
+
+def _intern_preparations(preparations):
+    if preparations is RAW_UNCUT:
+        return RAW_UNCUT
+
+    return tuple(_PREPARATIONS_CACHE[pair] for pair in preparations)
+
+
+_LAZY_TABLES = {
+    "FOODS_SPLITS": _foods_splits,
+    "FOOD_PREPARATIONS_SPLITS": _food_preparations_splits,
 }
 
-FOODS_COMPACT = {
-    "jeans": {
-        "properties": ["inedible"],
-        "locations": ["clothing.clothing showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "t-shirt": {
-        "properties": ["inedible"],
-        "locations": ["clothing.clothing showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "socks": {
-        "properties": ["inedible"],
-        "locations": ["clothing.clothing showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "suit": {
-        "properties": ["inedible"],
-        "locations": ["clothing.clothing showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "sweater": {
-        "properties": ["inedible"],
-        "locations": ["clothing.clothing showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "shorts": {
-        "properties": ["inedible"],
-        "locations": ["clothing.clothing showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "shirt": {
-        "properties": ["inedible"],
-        "locations": ["clothing.clothing showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "jacket": {
-        "properties": ["inedible"],
-        "locations": ["clothing.clothing showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "skirt": {
-        "properties": ["inedible"],
-        "locations": ["clothing.clothing showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "bra": {
-        "properties": ["inedible"],
-        "locations": ["clothing.clothing showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "coat": {
-        "properties": ["inedible"],
-        "locations": ["clothing.clothing showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "boots": {
-        "properties": ["inedible"],
-        "locations": ["clothing.clothing showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "hoodie": {
-        "properties": ["inedible"],
-        "locations": ["clothing.clothing showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "boxer shorts": {
-        "properties": ["inedible"],
-        "locations": ["clothing.clothing showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "scarf": {
-        "properties": ["inedible"],
-        "locations": ["clothing.clothing showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "toothpaste": {
-        "properties": ["inedible"],
-        "locations": ["hygiene.hygiene shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "toothbrush": {
-        "properties": ["inedible"],
-        "locations": ["hygiene.hygiene shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "deodorant": {
-        "properties": ["inedible"],
-        "locations": ["hygiene.hygiene shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "detergent": {
-        "properties": ["inedible"],
-        "locations": ["hygiene.hygiene shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "sponge": {
-        "properties": ["inedible"],
-        "locations": ["hygiene.hygiene shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "cotton balls": {
-        "properties": ["inedible"],
-        "locations": ["hygiene.hygiene shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "q tips": {
-        "properties": ["inedible"],
-        "locations": ["hygiene.hygiene shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "bar soap": {
-        "properties": ["inedible"],
-        "locations": ["hygiene.hygiene showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "shampoo": {
-        "properties": ["inedible"],
-        "locations": ["hygiene.hygiene showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "lotion": {
-        "properties": ["inedible"],
-        "locations": ["hygiene.ingredients showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "dental floss": {
-        "properties": ["inedible"],
-        "locations": ["hygiene.hygiene showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "tissues": {
-        "properties": ["inedible"],
-        "locations": ["hygiene.hygiene shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "broomstick": {
-        "properties": ["inedible"],
-        "locations": ["hygiene.hygiene shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "conditioner": {
-        "properties": ["inedible"],
-        "locations": ["hygiene.hygiene showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "hand sanitiser": {
-        "properties": ["inedible"],
-        "locations": ["hygiene.hygiene showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "broccoli": {
-        "properties": ["edible"],
-        "locations": ["vegetables.green veg basket", "checkout.basket"], #"supermarket.showcase"],
-    },
-    "aubergine": {
-        "properties": ["edible"],
-        "locations": ["vegetables.veg basket", "checkout.basket"], #"supermarket.showcase"],
-    },
-    "red radish": {
-        "properties": ["edible"],
-        "locations": ["vegetables.veg fridge", "checkout.fridge"], #"supermarket.showcase"],
-    },
-    "spinach": {
-        "properties": ["edible"],
-        "locations": ["vegetables.veg fridge", "checkout.fridge"], #"supermarket.showcase"],
-    },
-    "pink radish": {
-        "properties": ["edible"],
-        "locations": ["vegetables.veg fridge", "checkout.fridge"], #"supermarket.showcase"],
-    },
-    "black radish": {
-        "properties": ["edible"],
-        "locations": ["vegetables.veg fridge", "checkout.fridge"], #"supermarket.showcase"],
-    },
-    "pink radish": {
-        "properties": ["edible"],
-        "locations": ["vegetables.veg fridge", "checkout.fridge"], #"supermarket.showcase"],
-    },
-    "black grapes": {
-        "properties": ["edible"],
-        "locations": ["fruits.fruit basket", "checkout.basket"], #"supermarket.showcase"],
-    },
-    "red grapes": {
-        "properties": ["edible"],
-        "locations": ["fruits.fruit basket", "checkout.basket"], #"supermarket.showcase"],
-    },
-    "white grapes": {
-        "properties": ["edible"],
-        "locations": ["fruits.fruit basket", "checkout.basket"], #"supermarket.showcase"],
-    },
-    "pineapple": {
-        "properties": ["edible"],
-        "locations": ["fruits.yellow basket", "checkout.basket"], #"supermarket.showcase"],
-    },
-    "mango": {
-        "properties": ["edible"],
-        "locations": ["fruits.yellow basket", "checkout.basket"], #"supermarket.showcase"],
-    },
-    "plum": {
-        "properties": ["edible"],
-        "locations": ["fruits.fruit basket", "checkout.basket"], #"supermarket.showcase"],
-    },
-    "turkey bacon": {
-        "properties": ["edible"],
-        "locations": ["meats.meats fridge", "checkout.fridge"], #"supermarket.showcase"],
-    },
-    "beef bacon": {
-        "properties": ["edible"],
-        "locations": ["meats.meats fridge", "checkout.fridge"], #"supermarket.showcase"],
-    },
-    "pork bacon": {
-        "properties": ["edible"],
-        "locations": ["meats.meats fridge", "checkout.fridge"], #"supermarket.showcase"],
-    },
-    "cod": {
-        "properties": ["edible"],
-        "locations": ["meats.meats showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "salmon": {
-        "properties": ["edible"],
-        "locations": ["meats.meats showcase", "checkout.showcase"], #"supermarket.showcase"],
-    },
-    "pen": {
-        "properties": ["edible"],
-        "locations": ["stationery.stationery shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "paper": {
-        "properties": ["edible"],
-        "locations": ["stationery.stationery shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "eraser": {
-        "properties": ["edible"],
-        "locations": ["stationery.stationery shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "scissors": {
-        "properties": ["edible"],
-        "locations": ["stationery.stationery shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "notebook": {
-        "properties": ["edible"],
-        "locations": ["stationery.stationery shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "paper clips": {
-        "properties": ["edible"],
-        "locations": ["stationery.stationery shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "stapler": {
-        "properties": ["edible"],
-        "locations": ["stationery.stationery shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "folder": {
-        "properties": ["edible"],
-        "locations": ["stationery.stationery shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "pencil": {
-        "properties": ["edible"],
-        "locations": ["stationery.stationery shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "fountain pen": {
-        "properties": ["edible"],
-        "locations": ["stationery.stationery shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "highlighter": {
-        "properties": ["edible"],
-        "locations": ["stationery.stationery shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "smartphone": {
-        "properties": ["edible"],
-        "locations": ["hardware.hardware shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "vacuum cleaner": {
-        "properties": ["edible"],
-        "locations": ["hardware.hardware shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "monitor": {
-        "properties": ["edible"],
-        "locations": ["hardware.hardware shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "kettle": {
-        "properties": ["edible"],
-        "locations": ["hardware.hardware shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "microwave": {
-        "properties": ["edible"],
-        "locations": ["hardware.hardware shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "coffee maker": {
-        "properties": ["edible"],
-        "locations": ["hardware.hardware shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "keyboard": {
-        "properties": ["edible"],
-        "locations": ["hardware.hardware shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "dehumidifier": {
-        "properties": ["edible"],
-        "locations": ["hardware.hardware shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "blender": {
-        "properties": ["edible"],
-        "locations": ["hardware.hardware shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "smartwatch": {
-        "properties": ["edible"],
-        "locations": ["hardware.hardware shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "condensed milk": {
-        "properties": ["edible"],
-        "locations": ["ingredients.ingredients shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "cumin powder": {
-        "properties": ["edible"],
-        "locations": ["ingredients.ingredients shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "dark chocolate": {
-        "properties": ["edible"],
-        "locations": ["ingredients.ingredients shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "milk chocolate": {
-        "properties": ["edible"],
-        "locations": ["ingredients.ingredients shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "maple syrup": {
-        "properties": ["edible"],
-        "locations": ["ingredients.ingredients shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "white chocolate": {
-        "properties": ["edible"],
-        "locations": ["ingredients.ingredients shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "honey": {
-        "properties": ["edible"],
-        "locations": ["ingredients.ingredients shelf", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "chicken alfredo": {
-        "properties": ["edible"],
-        "locations": ["restaurant.restaurant table", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "meat shawarma": {
-        "properties": ["edible"],
-        "locations": ["restaurant.restaurant table", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "tandoori chicken": {
-        "properties": ["edible"],
-        "locations": ["restaurant.restaurant table", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "shrimp pizza": {
-        "properties": ["edible"],
-        "locations": ["restaurant.restaurant table", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "corned beef": {
-        "properties": ["edible"],
-        "locations": ["restaurant.restaurant table", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "beef lasagne": {
-        "properties": ["edible"],
-        "locations": ["restaurant.restaurant table", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "cheeseburger": {
-        "properties": ["edible"],
-        "locations": ["restaurant.restaurant table", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "cottage pie": {
-        "properties": ["edible"],
-        "locations": ["restaurant.restaurant table", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "shepherds pie": {
-        "properties": ["edible"],
-        "locations": ["restaurant.restaurant table", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    "fried chicken": {
-        "properties": ["edible"],
-        "locations": ["restaurant.restaurant table", "checkout.shelf"], #"supermarket.showcase"],
-    },
-    
-    # ORIGINAL COOKING 
+
+def __getattr__(name):
+    # PEP 562: materialize the big split tables on first attribute access
+    # instead of unconditionally at import.
+    try:
+        builder = _LAZY_TABLES[name]
+    except KeyError:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    value = builder()
+    globals()[name] = value  # Cache so later lookups bypass __getattr__.
+    return value
+
+
+# Immutable, pre-parsed view of a food entry. `locations` holds
+# (room, holder) pairs so the "room.holder" strings are only split once,
+# at import time; `holders` caches just the holder names in the same
+# order for the placement code.  `properties` stays an ordered tuple
+# (facts must be added in a stable order across processes) while
+# `properties_set` provides O(1) membership tests.
+FoodEntry = collections.namedtuple(
+    "FoodEntry",
+    ["type", "names", "indefinite", "properties", "properties_set", "locations", "holders"])
+
+
+# Many foods share the exact same location list (e.g. everything on the
+# hardware shelf); keep one frozen tuple per distinct list.
+_LOCATIONS_CACHE = {}
+
+
+def _freeze_food(infos):
+    locations = tuple(tuple(sys.intern(part) for part in location.split(".", 1))
+                      for location in infos["locations"])
+    locations = _LOCATIONS_CACHE.setdefault(locations, locations)
+    properties = tuple(sys.intern(p) for p in infos["properties"])
+    return FoodEntry(type=infos.get("type", "f"),
+                     names=tuple(infos["names"]) if "names" in infos else None,
+                     indefinite=infos.get("indefinite"),
+                     properties=properties,
+                     properties_set=frozenset(properties),
+                     locations=locations,
+                     holders=tuple(holder for _, holder in locations))
+
+
+# Most of the shop inventory only varies by name within a section of the
+# store: every item sharing a section holder gets the same edibility and
+# the same (section, checkout) locations.  Expand them from one table
+# instead of repeating the same four-line literal per item; only the
+# cooking ingredients below need bespoke entries.
+_FOOD_SECTIONS = {
+    "clothing showcase": (["inedible"], ["clothing.clothing showcase", "checkout.showcase"]),
+    "hygiene shelf": (["inedible"], ["hygiene.hygiene shelf", "checkout.shelf"]),
+    "hygiene showcase": (["inedible"], ["hygiene.hygiene showcase", "checkout.showcase"]),
+    "ingredients showcase": (["inedible"], ["hygiene.ingredients showcase", "checkout.showcase"]),
+    "green veg basket": (["edible"], ["vegetables.green veg basket", "checkout.basket"]),
+    "veg basket": (["edible"], ["vegetables.veg basket", "checkout.basket"]),
+    "veg fridge": (["edible"], ["vegetables.veg fridge", "checkout.fridge"]),
+    "fruit basket": (["edible"], ["fruits.fruit basket", "checkout.basket"]),
+    "yellow basket": (["edible"], ["fruits.yellow basket", "checkout.basket"]),
+    "meats fridge": (["edible"], ["meats.meats fridge", "checkout.fridge"]),
+    "meats showcase": (["edible"], ["meats.meats showcase", "checkout.showcase"]),
+    "stationery shelf": (["edible"], ["stationery.stationery shelf", "checkout.shelf"]),
+    "hardware shelf": (["edible"], ["hardware.hardware shelf", "checkout.shelf"]),
+    "ingredients shelf": (["edible"], ["ingredients.ingredients shelf", "checkout.shelf"]),
+    "restaurant table": (["edible"], ["restaurant.restaurant table", "checkout.shelf"]),
+}
+
+_SIMPLE_FOODS = [
+    ("jeans", "clothing showcase"),
+    ("t-shirt", "clothing showcase"),
+    ("socks", "clothing showcase"),
+    ("suit", "clothing showcase"),
+    ("sweater", "clothing showcase"),
+    ("shorts", "clothing showcase"),
+    ("shirt", "clothing showcase"),
+    ("jacket", "clothing showcase"),
+    ("skirt", "clothing showcase"),
+    ("bra", "clothing showcase"),
+    ("coat", "clothing showcase"),
+    ("boots", "clothing showcase"),
+    ("hoodie", "clothing showcase"),
+    ("boxer shorts", "clothing showcase"),
+    ("scarf", "clothing showcase"),
+    ("toothpaste", "hygiene shelf"),
+    ("toothbrush", "hygiene shelf"),
+    ("deodorant", "hygiene shelf"),
+    ("detergent", "hygiene shelf"),
+    ("sponge", "hygiene shelf"),
+    ("cotton balls", "hygiene shelf"),
+    ("q tips", "hygiene shelf"),
+    ("bar soap", "hygiene showcase"),
+    ("shampoo", "hygiene showcase"),
+    ("lotion", "ingredients showcase"),
+    ("dental floss", "hygiene showcase"),
+    ("tissues", "hygiene shelf"),
+    ("broomstick", "hygiene shelf"),
+    ("conditioner", "hygiene showcase"),
+    ("hand sanitiser", "hygiene showcase"),
+    ("broccoli", "green veg basket"),
+    ("aubergine", "veg basket"),
+    ("red radish", "veg fridge"),
+    ("spinach", "veg fridge"),
+    ("pink radish", "veg fridge"),
+    ("black radish", "veg fridge"),
+    ("black grapes", "fruit basket"),
+    ("red grapes", "fruit basket"),
+    ("white grapes", "fruit basket"),
+    ("pineapple", "yellow basket"),
+    ("mango", "yellow basket"),
+    ("plum", "fruit basket"),
+    ("turkey bacon", "meats fridge"),
+    ("beef bacon", "meats fridge"),
+    ("pork bacon", "meats fridge"),
+    ("cod", "meats showcase"),
+    ("salmon", "meats showcase"),
+    ("pen", "stationery shelf"),
+    ("paper", "stationery shelf"),
+    ("eraser", "stationery shelf"),
+    ("scissors", "stationery shelf"),
+    ("notebook", "stationery shelf"),
+    ("paper clips", "stationery shelf"),
+    ("stapler", "stationery shelf"),
+    ("folder", "stationery shelf"),
+    ("pencil", "stationery shelf"),
+    ("fountain pen", "stationery shelf"),
+    ("highlighter", "stationery shelf"),
+    ("smartphone", "hardware shelf"),
+    ("vacuum cleaner", "hardware shelf"),
+    ("monitor", "hardware shelf"),
+    ("kettle", "hardware shelf"),
+    ("microwave", "hardware shelf"),
+    ("coffee maker", "hardware shelf"),
+    ("keyboard", "hardware shelf"),
+    ("dehumidifier", "hardware shelf"),
+    ("blender", "hardware shelf"),
+    ("smartwatch", "hardware shelf"),
+    ("condensed milk", "ingredients shelf"),
+    ("cumin powder", "ingredients shelf"),
+    ("dark chocolate", "ingredients shelf"),
+    ("milk chocolate", "ingredients shelf"),
+    ("maple syrup", "ingredients shelf"),
+    ("white chocolate", "ingredients shelf"),
+    ("honey", "ingredients shelf"),
+    ("chicken alfredo", "restaurant table"),
+    ("meat shawarma", "restaurant table"),
+    ("tandoori chicken", "restaurant table"),
+    ("shrimp pizza", "restaurant table"),
+    ("corned beef", "restaurant table"),
+    ("beef lasagne", "restaurant table"),
+    ("cheeseburger", "restaurant table"),
+    ("cottage pie", "restaurant table"),
+    ("shepherds pie", "restaurant table"),
+    ("fried chicken", "restaurant table"),
+]
+
+FOODS_COMPACT = {}
+for _name, _section in _SIMPLE_FOODS:
+    _properties, _locations = _FOOD_SECTIONS[_section]
+    FOODS_COMPACT[_name] = {"properties": _properties, "locations": _locations}
+
+# Cooking ingredients ported from the cooking challenge keep bespoke
+# entries (alternative names, indefinite articles, extra locations).
+FOODS_COMPACT.update({
     "egg": {
         "properties": ["inedible", "cookable", "needs_cooking"],
         "locations": ["ingredients.ingredients fridge", "checkout.fridge"], #"supermarket.showcase"],
@@ -1133,16 +768,33 @@ FOODS_COMPACT = {
         "properties": ["edible", "cuttable", "uncut"],
         "locations": ["vegetables.green veg basket","vegetables.veg fridge", "checkout.fridge"], #"garden"],
     }
-}
+})
+
+FOODS_COMPACT = MappingProxyType({sys.intern(k): _freeze_food(v) for k, v in FOODS_COMPACT.items()})
+
+def _expand_foods():
+    # Entries with alternative names (e.g. "red apple"/"yellow apple")
+    # expand to one food per name, all sharing a single stripped entry.
+    for name, entry in FOODS_COMPACT.items():
+        if entry.names:
+            base = entry._replace(names=None)
+            for alias in entry.names:
+                yield sys.intern(alias), base
+        else:
+            yield name, entry
 
-FOODS = {}
-for k, v in FOODS_COMPACT.items():
-    if "names" in v:
-        for name in v["names"]:
-            FOODS[name] = dict(v)
-            del FOODS[name]["names"]
-    else:
-        FOODS[k] = v
+
+FOODS = dict(_expand_foods())
+
+# Reverse index: (room, holder) location -> names of the foods found there.
+# Built once so samplers can draw the foods of a location in O(1) instead
+# of rescanning every FOODS entry.
+LOCATION_INDEX = collections.defaultdict(list)
+for _name, _entry in FOODS.items():
+    for _location in _entry.locations:
+        LOCATION_INDEX[_location].append(_name)
+
+LOCATION_INDEX = MappingProxyType({location: tuple(names) for location, names in LOCATION_INDEX.items()})
 
 
 ENTITIES = {
@@ -1436,19 +1088,26 @@ ENTITIES = {
 
 }
 
+# Some ENTITIES locations are written as "room.holder" (e.g. the shopping
+# list at "checkout.counter"); pre-split the holder suffix once here so
+# pick_location gets ready-to-look-up names, frozen as interned tuples.
+for _infos in ENTITIES.values():
+    _infos["locations"] = tuple(sys.intern(location.rsplit(".", 1)[-1])
+                                for location in _infos["locations"])
+
 NEIGHBORS = {
-    "checkout": ["fruits", "stationery", "meats", "vegetables"],
-    "vegetables": ["checkout"],
-    "fruits": ["checkout", "clothing", "restaurant", "meats"],
-    "ingredients": ["meats"],
-    "clothing": ["fruits", "meats"],
-    "stationery": ["checkout", "hardware", "hygiene", "meats"],
-    "hardware": ["stationery"],
-    "hygiene": ["stationery"],
-    "restaurant": ["fruits", "security", "meats"],
-    "security": ["driveway", "carparking"],
-    "meats": ["fruits", "checkout", "clothing", "ingredients", "restaurant", "stationery"],
-    "carparking": ["security"],
+    "checkout": ("fruits", "stationery", "meats", "vegetables"),
+    "vegetables": ("checkout",),
+    "fruits": ("checkout", "clothing", "restaurant", "meats"),
+    "ingredients": ("meats",),
+    "clothing": ("fruits", "meats"),
+    "stationery": ("checkout", "hardware", "hygiene", "meats"),
+    "hardware": ("stationery",),
+    "hygiene": ("stationery",),
+    "restaurant": ("fruits", "security", "meats"),
+    "security": ("driveway", "carparking"),
+    "meats": ("fruits", "checkout", "clothing", "ingredients", "restaurant", "stationery"),
+    "carparking": ("security",),
 }
 
 ROOMS = [
@@ -1489,80 +1148,147 @@ DOORS = [
     },
 ]
 
-def pick_name(M, names, rng):
+def _pick(rng, seq):
+    """ Draw one element by integer indexing.
+
+    Unlike `rng.choice`, this avoids building a temporary NumPy array
+    from `seq` on every call.
+    """
+    return seq[rng.randint(len(seq))]
+
+
+def find_by_name(M, name, name_cache=None):
+    """ `M.find_by_name` with an optional cache of previous hits.
+
+    Only positive results are cached: callers like `pick_name` depend on
+    misses reflecting the maker's current state, and entities are never
+    renamed or removed during generation, so a cached hit stays valid.
+    """
+    if name_cache is None:
+        return M.find_by_name(name)
+
+    entity = name_cache.get(name)
+    if entity is None:
+        entity = M.find_by_name(name)
+        if entity is not None:
+            name_cache[name] = entity
+
+    return entity
+
+
+def pick_name(M, names, rng, name_cache=None):
     names = list(names)
     rng.shuffle(names)
     for name in names:
-        if M.find_by_name(name) is None:
+        if find_by_name(M, name, name_cache) is None:
             return name
 
     assert False
     return None
 
 
-def get_food_preparations(foods):
+@functools.lru_cache()
+def _all_food_preparations():
+    # get_food_preparations is pure; compute the table once for every
+    # known food and let the per-call function slice it.
     food_preparations = {}
-    for f in foods:
-        v = FOODS[f]
+    for f, v in FOODS.items():
         cookings = ["raw"]
-        if "cookable" in v["properties"]:
+        if "cookable" in v.properties_set:
             cookings = ["grilled", "fried", "roasted"]
-            if "needs_cooking" not in v["properties"]:
+            if "needs_cooking" not in v.properties_set:
                 cookings.append("raw")
 
         cuttings = ["uncut"]
-        if "cuttable" in v["properties"]:
+        if "cuttable" in v.properties_set:
             cuttings = ["uncut", "chopped", "sliced", "diced"]
 
-        food_preparations[f] = list(itertools.product(cookings, cuttings))
+        food_preparations[f] = tuple(_PREPARATIONS_CACHE[pair]
+                                     for pair in itertools.product(cookings, cuttings))
 
     return food_preparations
 
 
-def pick_location(M, locations, rng):
-    locations = list(locations)
-    rng.shuffle(locations)
-    for location in locations:
-        holder_name = location.split(".")[-1]
-        holder = M.find_by_name(holder_name)
+def get_food_preparations(foods):
+    all_preparations = _all_food_preparations()
+    return {f: all_preparations[f] for f in foods}
+
+
+@functools.lru_cache()
+def _split_tables(split):
+    # Per-split food list and preparation table, built once per process.
+    foods = _foods_splits()[split]
+    if split == "train":
+        preparations = dict(_food_preparations_splits()[split])
+    else:
+        preparations = get_food_preparations(foods)
+    return foods, MappingProxyType(preparations)
+
+
+def pick_location(M, holder_names, rng, name_cache=None):
+    # Holder names arrive pre-split: FOODS carry bare holders and the
+    # ENTITIES locations have their "room." prefixes stripped at import.
+    if len(holder_names) == 1:
+        # Nothing to shuffle (a 1-element shuffle consumes no randomness).
+        return find_by_name(M, holder_names[0], name_cache)
+
+    holder_names = list(holder_names)
+    rng.shuffle(holder_names)
+    for holder_name in holder_names:
+        holder = find_by_name(M, holder_name, name_cache)
         if holder:
             return holder
 
     return None
 
 
-def place_food(M, name, rng, place_it=True):
-    holder = pick_location(M, FOODS[name]["locations"], rng)
+def _place(M, name, type, holders, rng, adj="", desc=None, indefinite=None,
+           properties=(), place_it=True, name_cache=None):
+    # Shared placement body for foods and furnitures: pick a holder, create
+    # the entity, fill its infos and properties, then drop it in place.
+    holder = pick_location(M, holders, rng, name_cache)
     if holder is None and place_it:
         return None
 
-    food = M.new(type=FOODS[name].get("type", "f"), name=name)
-    food.infos.adj = ""
-    food.infos.noun = name
-    if "indefinite" in FOODS[name]:
-        food.infos.indefinite = FOODS[name]["indefinite"]
+    entity = M.new(type=type, name=name)
+    infos = entity.infos
+    infos.adj = adj
+    infos.noun = name
+    if desc is not None:
+        infos.desc = desc
+    if indefinite is not None:
+        infos.indefinite = indefinite
 
-    for property_ in FOODS[name]["properties"]:
-        food.add_property(property_)
+    for property_ in properties:
+        entity.add_property(property_)
 
     if place_it:
-        holder.add(food)
+        holder.add(entity)
+
+    return entity
+
 
-    return food
+def place_food(M, name, rng, place_it=True, name_cache=None):
+    entry = FOODS[name]
+    return _place(M, name, entry.type, entry.holders, rng,
+                  indefinite=entry.indefinite, properties=entry.properties,
+                  place_it=place_it, name_cache=name_cache)
 
 
-def place_foods(M, foods, rng):
+def place_foods(M, foods, rng, name_cache=None):
     entities = []
     for name in foods:
-        food = place_food(M, name, rng)
+        food = place_food(M, name, rng, name_cache=name_cache)
         if food:
             entities.append(food)
 
     return entities
 
 
-def place_random_foods(M, nb_foods, rng, allowed_foods=FOODS):
-    seen = set(food.name for food in M.findall(type="f"))
+def place_random_foods(M, nb_foods, rng, allowed_foods=FOODS, name_cache=None, seen=None):
+    if seen is None:
+        seen = {food.name for food in M.findall(type="f")}
+
     foods = [name for name in allowed_foods if name not in seen]
     rng.shuffle(foods)
     entities = []
@@ -1570,40 +1296,45 @@ def place_random_foods(M, nb_foods, rng, allowed_foods=FOODS):
         if len(entities) >= nb_foods:
             break
 
-        entities += place_foods(M, [food], rng)
+        entities += place_foods(M, [food], rng, name_cache=name_cache)
 
+    seen.update(entity.name for entity in entities)
     return entities
 
 
-def place_entity(M, name, rng) -> WorldEntity:
-    holder = pick_location(M, ENTITIES[name]["locations"], rng)
-    if holder is None:
-        return None  # Nowhere to place it.
-
-    entity = M.new(type=ENTITIES[name]["type"], name=name)
-    entity.infos.adj = ENTITIES[name]["adjs"][0]
-    entity.infos.noun = name
-    entity.infos.desc = ENTITIES[name]["desc"][0]
-    for property_ in ENTITIES[name]["properties"]:
-        entity.add_property(property_)
+def place_entity(M, name, rng, name_cache=None) -> "WorldEntity":
+    infos = ENTITIES[name]
+    return _place(M, name, infos["type"], infos["locations"], rng,
+                  adj=infos["adjs"][0], desc=infos["desc"][0],
+                  properties=infos["properties"], name_cache=name_cache)
 
-    holder.add(entity)
-    return entity
 
+def place_entities(M, names, rng, name_cache=None):
+    entities = []
+    for name in names:
+        entity = place_entity(M, name, rng, name_cache=name_cache)
+        if entity is not None:
+            entities.append(entity)
 
-def place_entities(M, names, rng):
-    return [place_entity(M, name, rng) for name in names]
+    return entities
 
 
-def place_random_furnitures(M, nb_furnitures, rng):
+def place_random_furnitures(M, nb_furnitures, rng, name_cache=None):
     furnitures = [k for k, v in ENTITIES.items() if v["type"] not in ["o", "f"]]
     # Skip existing furnitures.
-    furnitures = [furniture for furniture in furnitures if not M.find_by_name(furniture)]
+    furnitures = [furniture for furniture in furnitures if not find_by_name(M, furniture, name_cache)]
     rng.shuffle(furnitures)
-    return place_entities(M, furnitures[:nb_furnitures], rng)
+    return place_entities(M, furnitures[:nb_furnitures], rng, name_cache=name_cache)
+
 
+def move(M, G, start, end, path_cache=None):
+    if path_cache is not None:
+        commands = path_cache.get((start.id, end.id))
+        if commands is not None:
+            return list(commands)
+
+    import networkx as nx
 
-def move(M, G, start, end):
     path = nx.algorithms.shortest_path(G, start.id, end.id)
     commands = []
     current_room = start
@@ -1614,36 +1345,49 @@ def move(M, G, start, end):
 
         path = M.find_path(previous_room, current_room)
         if path.door:
-            commands.append("open {}".format(path.door.name))
+            commands.append(f"open {path.door.name}")
+
+        commands.append(f"go {direction}")
 
-        commands.append("go {}".format(direction))
+    if path_cache is not None:
+        path_cache[(start.id, end.id)] = tuple(commands)
 
     return commands
 
 
+_POSITIONING_FACTS = frozenset(["north_of", "south_of", "east_of", "west_of"])
+
+
 def compute_graph(M):
+    import networkx as nx
+
     G = nx.Graph()
     constraints = []
     G.add_nodes_from(room.id for room in M.rooms)
 
-    def is_positioning_fact(proposition: Proposition):
-        return proposition.name in ["north_of", "south_of", "east_of", "west_of"]
-
-    positioning_facts = [fact for fact in M.facts if is_positioning_fact(fact)]
-    for fact in positioning_facts:
-        G.add_edge(fact.arguments[0].name, fact.arguments[1].name)
-        constraints.append((fact.arguments[0].name, fact.name[:-3], fact.arguments[1].name))
+    for fact in M.facts:
+        if fact.name in _POSITIONING_FACTS:
+            G.add_edge(fact.arguments[0].name, fact.arguments[1].name)
+            constraints.append((fact.arguments[0].name, fact.name[:-3], fact.arguments[1].name))
 
     return G
 
 
 class RandomWalk:
     def __init__(self, neighbors, size=(5, 5), max_attempts=200, rng=None):
+        import numpy as np
+        import networkx as nx
+
         self.max_attempts = max_attempts
         self.neighbors = neighbors
+        # Frozensets for the membership tests in _walk; the ordered sequences
+        # are kept for iteration since their order feeds the seeded shuffles.
+        self._neighbor_sets = {room: frozenset(adjacent)
+                               for room, adjacent in neighbors.items()}
         self.rng = rng or np.random.RandomState(1234)
         self.grid = nx.grid_2d_graph(size[0], size[1], create_using=nx.OrderedGraph())
         self.nb_attempts = 0
+        self._failed = set()
 
     def _walk(self, G, node, remaining):
         if len(remaining) == 0:
@@ -1653,42 +1397,64 @@ class RandomWalk:
         if self.nb_attempts > self.max_attempts:
             return None
 
+        # The outcome of a walk only depends on which grid cells are occupied
+        # (and by which rooms), the cell we expand from, and the rooms left to
+        # place -- so a state that already led to a dead end can be pruned.
+        key = (node,
+               frozenset((cell, G.nodes[cell]["name"]) for cell in G),
+               frozenset(remaining))
+        if key in self._failed:
+            return None
+
         nodes = list(self.grid[node])
         self.rng.shuffle(nodes)
         for node_ in nodes:
-            neighbors = self.neighbors[G.nodes[node]["name"]]
+            name = G.nodes[node]["name"]
             if node_ in G:
-                if G.nodes[node_]["name"] not in neighbors:
+                if G.nodes[node_]["name"] not in self._neighbor_sets[name]:
                     continue
 
-                new_G = G.copy()
-                new_G.add_edge(node, node_, has_door=False, door_state=None, door_name=None)
-                new_G = self._walk(new_G, node_, remaining)
+                # Mutate G in place and undo on failure instead of copying the
+                # whole graph at every branch of the search.
+                had_edge = G.has_edge(node, node_)
+                G.add_edge(node, node_, has_door=False, door_state=None, door_name=None)
+                new_G = self._walk(G, node_, remaining)
                 if new_G:
                     return new_G
 
+                if not had_edge:
+                    G.remove_edge(node, node_)
+
             else:
-                neighbors = [n for n in neighbors if n in remaining]
+                neighbors = [n for n in self.neighbors[name] if n in remaining]
                 self.rng.shuffle(neighbors)
 
                 for neighbor in neighbors:
-                    new_G = G.copy()
-                    new_G.add_node(node_, id="r_{}".format(len(new_G)), name=neighbor)
-                    new_G.add_edge(node, node_, has_door=False, door_state=None, door_name=None)
-                    new_G = self._walk(new_G, node_, remaining - {neighbor})
+                    G.add_node(node_, id=f"r_{len(G)}", name=neighbor)
+                    G.add_edge(node, node_, has_door=False, door_state=None, door_name=None)
+                    new_G = self._walk(G, node_, remaining - {neighbor})
                     if new_G:
                         return new_G
 
+                    # Dropping the node also drops the edge added above.
+                    G.remove_node(node_)
+
+        # Only record genuine dead ends; running out of attempts says nothing
+        # about the state itself.
+        if self.nb_attempts <= self.max_attempts:
+            self._failed.add(key)
         return None
 
     def place_rooms(self, rooms):
+        import networkx as nx
+
         nodes = list(self.grid)
         self.rng.shuffle(nodes)
 
         for start in nodes:
             G = nx.OrderedGraph()
             room = rooms[0][0]
-            G.add_node(start, id="r_{}".format(len(G)), name=room, start=True)
+            G.add_node(start, id=f"r_{len(G)}", name=room, start=True)
 
             for group in rooms:
                 self.nb_attempts = 0
@@ -1702,14 +1468,14 @@ class RandomWalk:
         return None
 
 
-def make_graph_world(rng: RandomState, rooms: List[List[str]],
+def make_graph_world(rng: "RandomState", rooms: List[List[str]],
                      neighbors: Dict[str, List[str]], size: Tuple[int, int] = (5, 5)):
     walker = RandomWalk(neighbors=neighbors, size=(5, 5), rng=rng)
     G = walker.place_rooms(rooms)
     return G
 
 
-def make(settings: Mapping[str, str], options: Optional[GameOptions] = None) -> textworld.Game:
+def make(settings: Mapping[str, str], options: Optional["GameOptions"] = None) -> "textworld.Game":
     """ Make a Cooking game.
 
     Arguments:
@@ -1734,6 +1500,13 @@ def make(settings: Mapping[str, str], options: Optional[GameOptions] = None) ->
         * drop : Whether the player's inventory has limited capacity.
         * go : Number of locations in the game (1, 6, or 10).
     """
+    import numpy as np
+
+    import textworld
+    from textworld.generator.game import Quest, Event, GameOptions
+    from textworld.generator.data import KnowledgeBase
+    from textworld.utils import encode_seeds
+
     options = options or GameOptions()
 
     # Load knowledge base specific to this challenge.
@@ -1749,39 +1522,45 @@ def make(settings: Mapping[str, str], options: Optional[GameOptions] = None) ->
     rng_quest = rngs['quest']
     rng_recipe = np.random.RandomState(settings["list_seed"])
 
-    allowed_foods = list(FOODS)
-    allowed_food_preparations = get_food_preparations(list(FOODS))
-    if settings["split"] == "train":
-        allowed_foods = list(FOODS_SPLITS['train'])
-        allowed_food_preparations = dict(FOOD_PREPARATIONS_SPLITS['train'])
-    elif settings["split"] == "valid":
-        allowed_foods = list(FOODS_SPLITS['valid'])
-        allowed_food_preparations = get_food_preparations(FOODS_SPLITS['valid'])
-        # Also add food from the training set but with different preparations.
-        #allowed_foods += [f for f in FOODS if f in FOODS_SPLITS['train']]
-        #allowed_food_preparations.update(dict(FOOD_PREPARATIONS_SPLITS['valid']))
-    elif settings["split"] == "test":
-        allowed_foods = list(FOODS_SPLITS['test'])
-        allowed_food_preparations = get_food_preparations(FOODS_SPLITS['test'])
-        # Also add food from the training set but with different preparations.
+    if settings["split"] in ("train", "valid", "test"):
+        foods, preparations = _split_tables(settings["split"])
+        # Shallow copies; the cut/cook branches below rebuild them anyway.
+        allowed_foods = list(foods)
+        allowed_food_preparations = dict(preparations)
+        # For valid/test we could also add food from the training set but
+        # with different preparations.
         #allowed_foods += [f for f in FOODS if f in FOODS_SPLITS['train']]
-        #allowed_food_preparations.update(dict(FOOD_PREPARATIONS_SPLITS['test']))
+        #allowed_food_preparations.update(dict(_food_preparations_splits()[settings["split"]]))
+    else:
+        allowed_foods = list(FOODS)
+        allowed_food_preparations = get_food_preparations(list(FOODS))
 
     if settings.get("cut"):
         # If "cut" skill is specified, remove all "uncut" preparations.
-        for food, preparations in allowed_food_preparations.items():
-            allowed_food_preparations[food] = [preparation for preparation in preparations if "uncut" not in preparation]
+        # Preparations are (cooking, cutting) pairs, so compare the slot
+        # directly rather than scanning the tuple.
+        allowed_food_preparations = {food: [preparation for preparation in preparations if preparation[1] != "uncut"]
+                                     for food, preparations in allowed_food_preparations.items()}
 
     if settings.get("cook"):
-        # If "cook" skill is specified, remove all "raw" preparations.
-        for food, preparations in list(allowed_food_preparations.items()):
-            allowed_food_preparations[food] = [preparation for preparation in preparations if "raw" not in preparation]
-            if len(allowed_food_preparations[food]) == 0:
-                del allowed_food_preparations[food]
-                allowed_foods.remove(food)
+        # If "cook" skill is specified, remove all "raw" preparations and
+        # drop any food left without a preparation.
+        filtered = {food: [preparation for preparation in preparations if preparation[0] != "raw"]
+                    for food, preparations in allowed_food_preparations.items()}
+        allowed_food_preparations = {food: preparations
+                                     for food, preparations in filtered.items() if preparations}
+        allowed_foods = [food for food in allowed_foods if food in allowed_food_preparations]
 
     M = textworld.GameMaker(options)
 
+    # Cache successful name lookups for the rest of the generation; every
+    # helper below funnels through find_by_name(M, name, name_cache).
+    name_cache = {}
+
+    # Names of the foods placed so far, maintained incrementally so
+    # place_random_foods never has to rescan the maker's entities.
+    placed_food_names = set()
+
     recipe = M.new(type='RECIPE', name='')
     meal = M.new(type='meal', name='items')
     M.add_fact("out", meal, recipe)
@@ -1803,40 +1582,42 @@ def make(settings: Mapping[str, str], options: Optional[GameOptions] = None) ->
     rooms = M.import_graph(G)
 
     # Add doors
+    # M.find_path scans every path linearly; index them by room pair once.
+    paths_by_rooms = {frozenset((path.src.id, path.dest.id)): path for path in M.paths}
     for infos in DOORS:
-        room1 = M.find_by_name(infos["path"][0])
-        room2 = M.find_by_name(infos["path"][1])
+        room1 = find_by_name(M, infos["path"][0], name_cache)
+        room2 = find_by_name(M, infos["path"][1], name_cache)
         if room1 is None or room2 is None:
             continue  # This door doesn't exist in this world.
 
-        path = M.find_path(room1, room2)
+        path = paths_by_rooms.get(frozenset((room1.id, room2.id)))
         if path:
             assert path.door is None
-            name = pick_name(M, infos["names"], rng_objects)
+            name = pick_name(M, infos["names"], rng_objects, name_cache)
             door = M.new_door(path, name)
             door.add_property("closed")
 
     # Find kitchen.
-    kitchen = M.find_by_name("checkout") # Changed to checkout
+    kitchen = find_by_name(M, "checkout", name_cache) # Changed to checkout
 
     # The following predicates will be used to force the "prepare meal"
     # command to happen in the kitchen.
     M.add_fact("cooking_location", kitchen, recipe)
 
     # Place some default furnitures.
-    place_entities(M, ["basket", "counter", "fridge", "shelf", "showcase"], rng_objects)
+    place_entities(M, ["basket", "counter", "fridge", "shelf", "showcase"], rng_objects, name_cache=name_cache)
 
     # Place some random furnitures.
     nb_furnitures = rng_objects.randint(len(rooms), len(ENTITIES) + 1)
-    place_random_furnitures(M, nb_furnitures, rng_objects)
+    place_random_furnitures(M, nb_furnitures, rng_objects, name_cache=name_cache)
 
     # Place the cookbook and knife somewhere.
-    cookbook = place_entity(M, "shopping list", rng_objects) # shopping list instead of cookbook
+    cookbook = place_entity(M, "shopping list", rng_objects, name_cache=name_cache) # shopping list instead of cookbook
     cookbook.infos.synonyms = ["list"]
     #if rng_objects.rand() > 0.5 or settings.get("cut"):
         #knife = place_entity(M, "knife", rng_objects)
 
-    start_room = rng_map.choice(M.rooms)
+    start_room = _pick(rng_map, M.rooms)
     M.set_player(start_room)
 
     M.grammar = textworld.generator.make_grammar(options.grammar, rng=rng_grammar)
@@ -1854,7 +1635,8 @@ def make(settings: Mapping[str, str], options: Optional[GameOptions] = None) ->
     # Decide which ingredients are needed.
     nb_ingredients = settings.get("list", 1)
     assert nb_ingredients > 0 and nb_ingredients <= 5, "shopping list must have {1,2,3,4,5} items."
-    ingredient_foods = place_random_foods(M, nb_ingredients, rng_quest, allowed_foods)
+    ingredient_foods = place_random_foods(M, nb_ingredients, rng_quest, allowed_foods,
+                                          name_cache=name_cache, seen=placed_food_names)
 
     # Sort by name (to help differentiate unique recipes).
     ingredient_foods = sorted(ingredient_foods, key=lambda f: f.name)
@@ -1862,9 +1644,7 @@ def make(settings: Mapping[str, str], options: Optional[GameOptions] = None) ->
     # Decide on how the ingredients should be processed.
     ingredients = []
     for i, food in enumerate(ingredient_foods):
-        food_preparations = allowed_food_preparations[food.name]
-        idx = rng_quest.randint(0, len(food_preparations))
-        type_of_cooking, type_of_cutting = food_preparations[idx]
+        type_of_cooking, type_of_cutting = _pick(rng_quest, allowed_food_preparations[food.name])
         ingredients.append((food, type_of_cooking, type_of_cutting))
 
         # ingredient = M.new(type="ingredient", name="")
@@ -1893,7 +1673,7 @@ def make(settings: Mapping[str, str], options: Optional[GameOptions] = None) ->
     def _place_one_distractor(candidates, ingredient):
         rng_objects.shuffle(candidates)
         for food_name in candidates:
-            distractor = M.find_by_name(food_name)
+            distractor = find_by_name(M, food_name, name_cache)
             if distractor:
                 if distractor.parent == ingredient.parent:
                     break  # That object already exists and is considered as a distractor.
@@ -1901,10 +1681,18 @@ def make(settings: Mapping[str, str], options: Optional[GameOptions] = None) ->
                 continue  # That object already exists. Can't used it as distractor.
 
             # Place the distractor in the same "container" as the ingredient.
-            distractor = place_food(M, food_name, rng_objects, place_it=False)
+            distractor = place_food(M, food_name, rng_objects, place_it=False, name_cache=name_cache)
             ingredient.parent.add(distractor)
+            placed_food_names.add(food_name)
             break
 
+    # Distractor candidates share a name prefix or suffix with the
+    # ingredient.  Scan allowed_foods once per distinct affix; substring
+    # matching is kept on purpose ("pineapple" is a distractor for
+    # "red apple").
+    same_prefix_cache = {}
+    same_suffix_cache = {}
+
     for ingredient in ingredient_foods:
         if ingredient.parent == M.inventory and nb_ingredients_already_in_inventory >= inventory_limit:
             # If ingredient is in the inventory but inventory is full, do not add distractors.
@@ -1915,8 +1703,14 @@ def make(settings: Mapping[str, str], options: Optional[GameOptions] = None) ->
             continue  # No distractors.
 
         prefix, suffix = splits[0], splits[-1]
-        same_prefix_list = [f for f in allowed_foods if f.startswith(prefix) if f != ingredient.name]
-        same_suffix_list = [f for f in allowed_foods if f.endswith(suffix) if f != ingredient.name]
+        if prefix not in same_prefix_cache:
+            same_prefix_cache[prefix] = [f for f in allowed_foods if f.startswith(prefix)]
+
+        if suffix not in same_suffix_cache:
+            same_suffix_cache[suffix] = [f for f in allowed_foods if f.endswith(suffix)]
+
+        same_prefix_list = [f for f in same_prefix_cache[prefix] if f != ingredient.name]
+        same_suffix_list = [f for f in same_suffix_cache[suffix] if f != ingredient.name]
 
         if same_prefix_list:
             _place_one_distractor(same_prefix_list, ingredient)
@@ -1926,7 +1720,8 @@ def make(settings: Mapping[str, str], options: Optional[GameOptions] = None) ->
 
     # Add distractors foods. The amount is drawn from N(nb_ingredients, 3).
     nb_distractors = abs(int(rng_objects.randn(1) * 3 + nb_ingredients))
-    distractors = place_random_foods(M, nb_distractors, rng_objects, allowed_foods)
+    distractors = place_random_foods(M, nb_distractors, rng_objects, allowed_foods,
+                                     name_cache=name_cache, seen=placed_food_names)
 
     # If recipe_seed is positive, a new recipe is sampled.
     if settings["list_seed"] > 0:
@@ -1938,76 +1733,101 @@ def make(settings: Mapping[str, str], options: Optional[GameOptions] = None) ->
         # Decide on how the ingredients of the new recipe should be processed.
         ingredients = []
         for i, food in enumerate(ingredient_foods):
-            food_preparations = allowed_food_preparations[food.name]
-            idx = rng_recipe.randint(0, len(food_preparations))
-            type_of_cooking, type_of_cutting = food_preparations[idx]
+            type_of_cooking, type_of_cutting = _pick(rng_recipe, allowed_food_preparations[food.name])
             ingredients.append((food, type_of_cooking, type_of_cutting))
 
-    # Add necessary facts about the recipe.
+    # Add necessary facts about the recipe. Bind the bound methods once
+    # rather than resolving the attributes on every iteration.
+    new = M.new
+    add_fact = M.add_fact
+    nowhere_append = M.nowhere.append
     for i, (food, type_of_cooking, type_of_cutting) in enumerate(ingredients):
-        ingredient = M.new(type="ingredient", name="")
-        food.add_property("ingredient_{}".format(i + 1))
-        M.add_fact("base", food, ingredient)
-        M.add_fact(type_of_cutting, ingredient)
-        M.add_fact(type_of_cooking, ingredient)
-        M.add_fact("in", ingredient, recipe)
-        M.nowhere.append(ingredient)
+        ingredient = new(type="ingredient", name="")
+        food.add_property(f"ingredient_{i + 1}")
+        add_fact("base", food, ingredient)
+        add_fact(type_of_cutting, ingredient)
+        add_fact(type_of_cooking, ingredient)
+        add_fact("in", ingredient, recipe)
+        nowhere_append(ingredient)
 
     # Depending on the skills and how the ingredient should be processed
     # we change the predicates of the food objects accordingly.
+    needs_cooked = not settings.get("cook")  # Food should already be cooked accordingly.
+    needs_cut = not settings.get("cut")  # Food should already be cut accordingly.
     for food, type_of_cooking, type_of_cutting in ingredients:
-        if not settings.get("cook"):  # Food should already be cooked accordingly.
+        if needs_cooked:
+            # Each has_property call rebuilds the property list; snapshot the
+            # names once per food instead.
+            properties = {fact.name for fact in food.properties}
             food.add_property(type_of_cooking)
             food.add_property("cooked")
-            if food.has_property("inedible"):
+            if "inedible" in properties:
                 food.add_property("edible")
                 food.remove_property("inedible")
-            if food.has_property("raw"):
+            # A drawn "raw" cooking was added above and must come off again,
+            # just like a pre-existing "raw" property.
+            if "raw" in properties or type_of_cooking == "raw":
                 food.remove_property("raw")
-            if food.has_property("needs_cooking"):
+            if "needs_cooking" in properties:
                 food.remove_property("needs_cooking")
 
-        if not settings.get("cut"):  # Food should already be cut accordingly.
+        if needs_cut:
             food.add_property(type_of_cutting)
             food.remove_property("uncut")
 
-    if not settings.get("open"):
-        for entity in M._entities.values():
-            if entity.has_property("closed"):
-                entity.remove_property("closed")
-                entity.add_property("open")
+    # Single pass over the entities: open whatever should start open and
+    # sanity check that every container/door got closed/open/locked. No
+    # container or door is created after this point (only "slot" entities).
+    force_open = not settings.get("open")
+    for entity in M._entities.values():
+        # One scan of the entity's facts instead of one per has_property.
+        properties = {fact.name for fact in entity.properties}
+        if force_open and "closed" in properties:
+            entity.remove_property("closed")
+            entity.add_property("open")
+
+        if entity.type in {"c", "d"}:
+            # A flipped "closed" still passes the check through its snapshot.
+            if not ("closed" in properties or "open" in properties
+                    or "locked" in properties):
+                raise ValueError("Forgot to add closed/locked/open property for '{}'.".format(entity.name))
 
     walkthrough = []
     # Build TextWorld quests.
     quests = []
     consumed_ingredient_events = []
+    new_fact = M.new_fact
     for i, ingredient in enumerate(ingredients):
-        ingredient_consumed = Event(conditions={M.new_fact("consumed", ingredient[0])})
+        ingredient_consumed = Event(conditions={new_fact("consumed", ingredient[0])})
         consumed_ingredient_events.append(ingredient_consumed)
-        ingredient_burned = Event(conditions={M.new_fact("burned", ingredient[0])})
-        quests.append(Quest(win_events=[], fail_events=[ingredient_burned]))
+        ingredient_burned = Event(conditions={new_fact("burned", ingredient[0])})
+        quests.append(Quest(win_events=(), fail_events=[ingredient_burned]))
 
         if ingredient[0] not in M.inventory:
-            holding_ingredient = Event(conditions={M.new_fact("in", ingredient[0], M.inventory)})
+            holding_ingredient = Event(conditions={new_fact("in", ingredient[0], M.inventory)})
             quests.append(Quest(win_events=[holding_ingredient]))
 
-        win_events = []
         if ingredient[1] != TYPES_OF_COOKING[0] and not ingredient[0].has_property(ingredient[1]):
-            win_events += [Event(conditions={M.new_fact(ingredient[1], ingredient[0])})]
-
-        fail_events = [Event(conditions={M.new_fact(t, ingredient[0])})
-                       for t in set(TYPES_OF_COOKING[1:]) - {ingredient[1]}]  # Wrong cooking.
+            win_events = (Event(conditions={new_fact(ingredient[1], ingredient[0])}),)
+        else:
+            win_events = ()
 
-        quests.append(Quest(win_events=win_events, fail_events=[ingredient_consumed] + fail_events))
+        # Wrong cooking.
+        fail_events = [ingredient_consumed,
+                       *(Event(conditions={new_fact(t, ingredient[0])})
+                         for t in _WRONG_COOKING.difference((ingredient[1],)))]
+        quests.append(Quest(win_events=win_events, fail_events=fail_events))
 
-        win_events = []
         if ingredient[2] != TYPES_OF_CUTTING[0] and not ingredient[0].has_property(ingredient[2]):
-            win_events += [Event(conditions={M.new_fact(ingredient[2], ingredient[0])})]
-
-        fail_events = [Event(conditions={M.new_fact(t, ingredient[0])})
-                       for t in set(TYPES_OF_CUTTING[1:]) - {ingredient[2]}]  # Wrong cutting.
+            win_events = (Event(conditions={new_fact(ingredient[2], ingredient[0])}),)
+        else:
+            win_events = ()
 
-        quests.append(Quest(win_events=win_events, fail_events=[ingredient_consumed] + fail_events))
+        # Wrong cutting.
+        fail_events = [ingredient_consumed,
+                       *(Event(conditions={new_fact(t, ingredient[0])})
+                         for t in _WRONG_CUTTING.difference((ingredient[2],)))]
+        quests.append(Quest(win_events=win_events, fail_events=fail_events))
     
     
         
@@ -2026,35 +1846,41 @@ def make(settings: Mapping[str, str], options: Optional[GameOptions] = None) ->
     # Build walkthrough.
     current_room = start_room
     walkthrough = []
+    path_cache = {}  # The same room pair recurs across ingredients.
+
+    walkthrough_append = walkthrough.append
+    walkthrough_extend = walkthrough.extend
 
     # Start by checking the inventory.
-    #walkthrough.append("inventory")
+    #walkthrough_append("inventory")
 
     # 0. Find the kitchen and read the cookbook.
-    walkthrough += move(M, G, current_room, kitchen)
+    walkthrough_extend(move(M, G, current_room, kitchen, path_cache))
     current_room = kitchen
-    walkthrough.append("examine shopping list")
+    walkthrough_append("examine shopping list")
 
     # 1. Drop unneeded objects.
+    ingredient_set = set(ingredient_foods)
     for entity in M.inventory.content:
-        if entity not in ingredient_foods:
-            walkthrough.append("drop {}".format(entity.name))
+        if entity not in ingredient_set:
+            walkthrough_append(f"drop {entity.name}")
 
     # 2. Collect the ingredients.
     for food, type_of_cooking, type_of_cutting in ingredients:
-        if food.parent == M.inventory:
+        holder = food.parent
+        if holder is M.inventory:
             continue
 
-        food_room = food.parent.parent if food.parent.parent else food.parent
-        walkthrough += move(M, G, current_room, food_room)
+        food_room = holder.parent if holder.parent else holder
+        walkthrough_extend(move(M, G, current_room, food_room, path_cache))
 
-        if food.parent.has_property("closed"):
-            walkthrough.append("open {}".format(food.parent.name))
+        if holder.has_property("closed"):
+            walkthrough_append(f"open {holder.name}")
 
-        if food.parent == food_room:
-            walkthrough.append("take {}".format(food.name))
+        if holder is food_room:
+            walkthrough_append(f"take {food.name}")
         else:
-            walkthrough.append("take {} from {}".format(food.name, food.parent.name))
+            walkthrough_append(f"take {food.name} from {holder.name}")
 
         current_room = food_room
 
@@ -2131,7 +1957,9 @@ def make(settings: Mapping[str, str], options: Optional[GameOptions] = None) ->
         {directions}
         """
     )
-    recipe_ingredients = "\n".join(ingredient[0].name for ingredient in ingredients)
+    # Extracted once and reused below for the game's metadata.
+    items = [(food.name, cooking, cutting) for food, cooking, cutting in ingredients]
+    recipe_ingredients = "\n".join(item[0] for item in items)
     
     recipe_directions = []
     '''
@@ -2151,22 +1979,11 @@ def make(settings: Mapping[str, str], options: Optional[GameOptions] = None) ->
 
     if settings.get("drop"):
         # Limit capacity of the inventory.
+        used_count = len(M.inventory.content)
         for i in range(inventory_limit):
-            slot = M.new(type="slot", name="")
-            if i < len(M.inventory.content):
-                slot.add_property("used")
-            else:
-                slot.add_property("free")
-
-            M.nowhere.append(slot)
-
-    # Sanity checks:
-    for entity in M._entities.values():
-        if entity.type in ["c", "d"]:
-            if not (entity.has_property("closed")
-                    or entity.has_property("open")
-                    or entity.has_property("locked")):
-                raise ValueError("Forgot to add closed/locked/open property for '{}'.".format(entity.name))
+            slot = new(type="slot", name="")
+            slot.add_property("used" if i < used_count else "free")
+            nowhere_append(slot)
 
     if not settings.get("drop"):
         M.set_walkthrough(walkthrough)
@@ -2180,7 +1997,7 @@ def make(settings: Mapping[str, str], options: Optional[GameOptions] = None) ->
         "seeds": options.seeds,
         "goal": cookbook.infos.desc,
         "shopping list": recipe,
-        "items": [(food.name, cooking, cutting) for food, cooking, cutting in ingredients],
+        "items": items,
         "settings": settings,
         "entities": [e.name for e in M._entities.values() if e.name],
         "nb_distractors": nb_distractors,
@@ -2193,8 +2010,8 @@ def make(settings: Mapping[str, str], options: Optional[GameOptions] = None) ->
     game.objective = objective
 
     game.metadata = metadata
-    skills_uuid = "+".join("{}{}".format(k, "" if settings[k] is True else settings[k])
-                           for k in SKILLS if k in settings and settings[k])
+    active_skills = {k: settings[k] for k in SKILLS if settings.get(k)}
+    skills_uuid = "+".join(k if v is True else f"{k}{v}" for k, v in active_skills.items())
     uuid = "tw-shopping{split}-{specs}-{seeds}"
     uuid = uuid.format(split="-{}".format(settings["split"]) if settings.get("split") else "",
                        specs=skills_uuid,